@@ -1,9 +1,30 @@
 """Agent implementations for the AI agents system."""
 
+from typing import TYPE_CHECKING
+
 from .protocols import Agent, AgentResponse, AgentResponseStatus, BaseAgent
 from .youtube_transcription_agent import YouTubeTranscriptionAgent
-from .text_summarizer_agent import TextSummarizerAgent
-from .youtube_channel_agent import YouTubeChannelAgent
+
+if TYPE_CHECKING:
+    from .text_summarizer_agent import TextSummarizerAgent
+    from .youtube_channel_agent import YouTubeChannelAgent
+
+# Agents with heavy dependencies (openai, azure) are imported on first access
+_LAZY_AGENTS = {
+    "TextSummarizerAgent": ".text_summarizer_agent",
+    "YouTubeChannelAgent": ".youtube_channel_agent",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_AGENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "Agent",
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, Protocol, runtime_checkable
-from dataclasses import dataclass
 from enum import Enum
 
+import msgspec
+
 
 class AgentResponseStatus(Enum):
     """Standard status codes for agent responses."""
@@ -11,9 +12,12 @@ class AgentResponseStatus(Enum):
     PARTIAL = "partial"
 
 
-@dataclass
-class AgentResponse:
-    """Standard response format for all agents."""
+class AgentResponse(msgspec.Struct, omit_defaults=True):
+    """
+    Standard response format for all agents.
+    
+    Encode directly with `msgspec.json.encode(response)`; unset fields are omitted.
+    """
     status: AgentResponseStatus
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
@@ -23,7 +27,7 @@ class AgentResponse:
     @property
     def success(self) -> bool:
         """Check if the response indicates success."""
-        return self.status == AgentResponseStatus.SUCCESS
+        return self.status is AgentResponseStatus.SUCCESS
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert response to dictionary format for backward compatibility."""
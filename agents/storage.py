@@ -1,27 +1,98 @@
-import json
 import logging
-from abc import ABC, abstractmethod
+import mmap
+import os
+import sys
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple, Union
 
-from azure.core.exceptions import ResourceNotFoundError
-from azure.storage.blob import BlobServiceClient
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import BlobServiceClient, ExponentialRetry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
 
 logger = logging.getLogger(__name__)
 
+# A single state mutation: (section, key, value), e.g. ("last_seen", "UC...", "videoId")
+StateChange = Tuple[str, str, str]
+
+
+def _dumps(state: Dict[str, Dict], pretty: bool = False) -> bytes:
+    """Serialize state to UTF-8 JSON bytes, preferring orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(state, indent=2 if pretty else None).encode("utf-8")
+
+
+def _loads(data: Union[bytes, bytearray, str]) -> Dict[str, Dict]:
+    """Deserialize JSON state; orjson accepts bytes natively."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode_snapshot(state: Dict[str, Dict]) -> bytes:
+    """Encode full state as a single append-log line."""
+    return _dumps({"op": "snapshot", "v": state}) + b"\n"
+
+
+def _encode_changes(changes: List[StateChange]) -> bytes:
+    """Encode mutations as append-log lines."""
+    return b"".join(_dumps({"op": op, "k": key, "v": value}) + b"\n" for op, key, value in changes)
 
-class StateStorage(ABC):
-    """Abstract base class for state storage implementations."""
+
+def _replay(lines: Iterable[bytes]) -> Tuple[Dict[str, Dict], int]:
+    """
+    Rebuild state from append-log lines.
+    
+    Returns the state and the number of mutations applied since the last snapshot;
+    an unreadable (e.g. torn) line reports `sys.maxsize` so the next save compacts.
+    """
+    state: Dict[str, Dict] = {"resolved": {}, "last_seen": {}}
+    pending = 0
+    damaged = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = _loads(line)
+            op = record.get("op")
+            if op == "snapshot":
+                snapshot = record["v"]
+                snapshot.setdefault("resolved", {})
+                snapshot.setdefault("last_seen", {})
+                state = snapshot
+                pending = 0
+            elif op in ("resolved", "last_seen"):
+                state[op][record["k"]] = record["v"]
+                pending += 1
+        except (ValueError, AttributeError, KeyError, TypeError) as ex:
+            # A torn or malformed line should not discard the rest of the log
+            logger.warning(f"Skipping unreadable state log line: {ex}")
+            damaged = True
+    return state, sys.maxsize if damaged else pending
+
+
+class StateStorage(Protocol):
+    """
+    Interface for state storage implementations.
+    
+    Storages are matched structurally. A storage may also provide
+    `save_changes(state, changes)` to persist only the mutations since the last
+    save; otherwise the full state is passed to `save`.
+    """
     
-    @abstractmethod
     def load(self) -> Dict[str, Dict]:
         """Load state from storage."""
-        pass
+        ...
     
-    @abstractmethod
     def save(self, state: Dict[str, Dict]) -> None:
         """Save state to storage."""
-        pass
+        ...
 
 
 class LocalFileStorage(StateStorage):
@@ -34,8 +105,13 @@ class LocalFileStorage(StateStorage):
         """Load state from local file."""
         try:
             if self.file_path.exists():
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.file_path, 'rb') as f:
+                    if orjson is not None and os.fstat(f.fileno()).st_size:
+                        # Parse straight from the mapped pages without an intermediate copy
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                return orjson.loads(view)
+                    return _loads(f.read())
         except Exception as ex:
             logger.warning(f"Error loading local state file: {ex}")
         
@@ -48,9 +124,11 @@ class LocalFileStorage(StateStorage):
             # Create directory if needed
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Save with pretty formatting for easier debugging
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2)
+            # Save with pretty formatting for easier debugging; write to a temp
+            # file and swap it in so readers never see a partially written file
+            tmp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+            tmp_path.write_bytes(_dumps(state, pretty=True))
+            os.replace(tmp_path, self.file_path)
         except Exception as ex:
             logger.error(f"Error saving local state file: {ex}")
             raise
@@ -63,6 +141,30 @@ class BlobStorage(StateStorage):
         self.blob_service = blob_service
         self.container = container
         self.blob_name = blob_name
+        self._container_ensured = False
+    
+    @classmethod
+    def from_connection_string(cls, connection_string: str, **kwargs) -> "BlobStorage":
+        """Create blob storage with exponential backoff for throttled or transient failures."""
+        blob_service = BlobServiceClient.from_connection_string(
+            connection_string,
+            retry_policy=ExponentialRetry(initial_backoff=2, increment_base=2, retry_total=4)
+        )
+        return cls(blob_service, **kwargs)
+    
+    def _get_container_client(self):
+        """Return the state container client, creating the container on first use."""
+        container_client = self.blob_service.get_container_client(self.container)
+        if not self._container_ensured:
+            try:
+                container_client.create_container()
+                self._container_ensured = True
+            except ResourceExistsError:
+                self._container_ensured = True
+            except Exception as ex:
+                # e.g. no permission to create; let the upload surface real problems
+                logger.debug(f"Could not create state container: {ex}")
+        return container_client
     
     def load(self) -> Dict[str, Dict]:
         """Load state from blob storage."""
@@ -70,7 +172,7 @@ class BlobStorage(StateStorage):
         blob_client = container_client.get_blob_client(self.blob_name)
         try:
             data = blob_client.download_blob().readall()
-            return json.loads(data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data)
+            return _loads(data)
         except ResourceNotFoundError:
             logger.info("State blob not found; starting fresh.")
             return {"resolved": {}, "last_seen": {}}
@@ -80,14 +182,151 @@ class BlobStorage(StateStorage):
     
     def save(self, state: Dict[str, Dict]) -> None:
         """Save state to blob storage."""
+        blob_client = self._get_container_client().get_blob_client(self.blob_name)
+        blob_client.upload_blob(_dumps(state), overwrite=True, max_concurrency=4)
+
+
+class JsonlAppendStorage(StateStorage):
+    """
+    Local state storage kept as an append-only log of mutations.
+    
+    Each save appends only the changed entries; every `compact_every` mutations
+    the log is rewritten atomically as a single snapshot line.
+    """
+    
+    def __init__(self, file_path: str = ".youtube_monitor_state.jsonl", compact_every: int = 100):
+        self.file_path = Path(file_path)
+        self.compact_every = compact_every
+        self._pending = 0
+    
+    def load(self) -> Dict[str, Dict]:
+        """Load state by replaying the local log."""
+        try:
+            if self.file_path.exists():
+                with open(self.file_path, 'rb') as f:
+                    state, self._pending = _replay(f)
+                return state
+        except Exception as ex:
+            logger.warning(f"Error loading local state log: {ex}")
+        
+        logger.info("State log not found; starting fresh.")
+        return {"resolved": {}, "last_seen": {}}
+    
+    def save(self, state: Dict[str, Dict]) -> None:
+        """Compact the log into a single snapshot line."""
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+            tmp_path.write_bytes(_encode_snapshot(state))
+            os.replace(tmp_path, self.file_path)
+            self._pending = 0
+        except Exception as ex:
+            logger.error(f"Error saving local state log: {ex}")
+            raise
+    
+    def save_changes(self, state: Dict[str, Dict], changes: List[StateChange]) -> None:
+        """Append the mutations, compacting once enough have accumulated."""
+        if not self.file_path.exists() or self._pending + len(changes) >= self.compact_every:
+            self.save(state)
+            return
+        try:
+            with open(self.file_path, 'ab') as f:
+                f.write(_encode_changes(changes))
+            self._pending += len(changes)
+        except Exception as ex:
+            logger.error(f"Error appending to local state log: {ex}")
+            raise
+
+
+class AppendBlobStorage(BlobStorage):
+    """
+    Azure state storage kept as a snapshot block blob plus an append blob log.
+    
+    The snapshot (`blob_name`) is replaced in a single request and records its
+    generation in blob metadata; steady-state saves append one block with only the
+    changed entries to the `{blob_name}.{generation}` log. Every `compact_every`
+    mutations a new snapshot starts the next generation with a fresh log, so an
+    interrupted compaction leaves the previous snapshot and its log intact.
+    """
+    
+    def __init__(
+        self,
+        blob_service: BlobServiceClient,
+        container: str = "youtube-monitor",
+        blob_name: str = "state.jsonl",
+        compact_every: int = 100
+    ):
+        super().__init__(blob_service, container=container, blob_name=blob_name)
+        self.compact_every = compact_every
+        self._pending = 0
+        self._generation = 0
+    
+    def _log_name(self, generation: int) -> str:
+        return f"{self.blob_name}.{generation}"
+    
+    def load(self) -> Dict[str, Dict]:
+        """Load state by replaying the current generation's log over its snapshot."""
         container_client = self.blob_service.get_container_client(self.container)
         try:
-            container_client.create_container()
-        except Exception:
-            # ignore if already exists
-            pass
-        blob_client = container_client.get_blob_client(self.blob_name)
-        blob_client.upload_blob(json.dumps(state), overwrite=True)
+            try:
+                snapshot = container_client.get_blob_client(self.blob_name).download_blob()
+                data = snapshot.readall()
+                self._generation = int((snapshot.properties.metadata or {}).get("generation", 0))
+            except ResourceNotFoundError:
+                # No compaction yet; changes may still have been logged
+                data = b""
+                self._generation = 0
+            try:
+                log = container_client.get_blob_client(self._log_name(self._generation)).download_blob().readall()
+            except ResourceNotFoundError:
+                log = b""
+            if not data and not log:
+                logger.info("State blob not found; starting fresh.")
+            state, self._pending = _replay(data.splitlines() + log.splitlines())
+            return state
+        except Exception as ex:
+            logger.warning(f"Error loading state blob: {ex}")
+            return {"resolved": {}, "last_seen": {}}
+    
+    def save(self, state: Dict[str, Dict]) -> None:
+        """Write a new snapshot and start the next generation's log."""
+        container_client = self._get_container_client()
+        generation = self._generation + 1
+        
+        # Create the (empty) next log first: until the snapshot below lands, readers
+        # keep using the previous snapshot and log, so a crash in between loses nothing
+        container_client.get_blob_client(self._log_name(generation)).create_append_blob()
+        container_client.get_blob_client(self.blob_name).upload_blob(
+            _encode_snapshot(state),
+            overwrite=True,
+            metadata={"generation": str(generation)}
+        )
+        self._generation = generation
+        self._pending = 0
+        
+        # Readers that loaded the previous snapshot still need its log; drop the one before
+        if generation >= 2:
+            try:
+                container_client.delete_blob(self._log_name(generation - 2))
+            except ResourceNotFoundError:
+                pass
+            except Exception as ex:
+                logger.debug(f"Could not delete old state log: {ex}")
+    
+    def save_changes(self, state: Dict[str, Dict], changes: List[StateChange]) -> None:
+        """Append the mutations as one block, compacting once enough have accumulated."""
+        if self._pending + len(changes) >= self.compact_every:
+            self.save(state)
+            return
+        log_client = self._get_container_client().get_blob_client(self._log_name(self._generation))
+        data = _encode_changes(changes)
+        try:
+            log_client.append_block(data)
+        except ResourceNotFoundError:
+            # First change of this generation (or the log was removed): start the log
+            log_client.create_append_blob()
+            log_client.append_block(data)
+        self._pending += len(changes)
 
 
 class StateManager:
@@ -101,25 +340,44 @@ class StateManager:
     def __init__(self, storage: StateStorage):
         self.storage = storage
         self._state: Dict[str, Dict] = {"resolved": {}, "last_seen": {}}
+        self._changes: List[StateChange] = []
 
     def load(self) -> None:
         """Load state from configured storage."""
-        self._state = self.storage.load()
+        state = self.storage.load()
+        # Guarantee both sections exist so accessors can index them directly
+        state.setdefault("resolved", {})
+        state.setdefault("last_seen", {})
+        self._state = state
+        self._changes = []
 
     def save(self) -> None:
-        """Save state to configured storage."""
-        self.storage.save(self._state)
+        """Save state to configured storage if it has changed."""
+        if not self._changes:
+            return
+        save_changes = getattr(self.storage, "save_changes", None)
+        if save_changes is not None:
+            save_changes(self._state, self._changes)
+        else:
+            self.storage.save(self._state)
+        self._changes = []
 
     # resolved cache methods
     def get_resolved(self, identifier: str) -> Optional[str]:
-        return self._state.get("resolved", {}).get(identifier)
+        return self._state["resolved"].get(identifier)
 
     def set_resolved(self, identifier: str, channel_id: str) -> None:
-        self._state.setdefault("resolved", {})[identifier] = channel_id
+        resolved = self._state["resolved"]
+        if resolved.get(identifier) != channel_id:
+            resolved[identifier] = channel_id
+            self._changes.append(("resolved", identifier, channel_id))
 
     # last seen video methods
     def get_last_seen(self, channel_id: str) -> Optional[str]:
-        return self._state.get("last_seen", {}).get(channel_id)
+        return self._state["last_seen"].get(channel_id)
 
     def set_last_seen(self, channel_id: str, video_id: str) -> None:
-        self._state.setdefault("last_seen", {})[channel_id] = video_id
+        last_seen = self._state["last_seen"]
+        if last_seen.get(channel_id) != video_id:
+            last_seen[channel_id] = video_id
+            self._changes.append(("last_seen", channel_id, video_id))
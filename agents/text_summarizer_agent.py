@@ -1,12 +1,62 @@
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from .protocols import BaseAgent, AgentResponse, AgentResponseStatus
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_REQUESTS = 8
+
+_BASE_INSTRUCTIONS = """
+You are expert in summarizing text and providing highly readable and informative summary article for users.
+Treat the audience of the article as person who is not familiar of the concepts and who wants to learn them.
+
+# Goals
+1) Write a summary in article form that is easily understandable for a first-time reader with no prior context. The summary must be written in clear 
+descriptive paragraphs—not just bullet points—where each topic is explained in full sentences and connected ideas.
+2) Ensure the content is action-first and uses concrete examples throughout to illustrate key points. Where relevant, incorporate links to verified resources 
+or actionable search queries that the reader can use immediately.
+3) Cover all main topics in the article, providing enough detail, context, and explanation for clarity. To make this happen, before creating the article,
+extract all topics internally first, however do not list the extracted topics in the article but use them when creating the article by following style rules
+and desired structure of the document as described below.
+
+# Style rules
+Use plain English; avoid jargon. If you must use a term, define it the first time. Use neutral / impersonal voice.
+No unexplained abbreviations. If you include one, expand it once (for example: Total Addressable Market).
+Format links as Title so they are clickable. Use this format for links
+[Link title](http address)
+Use bullet points only in Top actions and Key term definitions
+
+# Structure of the document
+Use Markdown format and format the structure to look readable for user, use specified font for titles and sections
+
+1. Title (H1)
+
+2. TL;DR (1-2 sentences) (H2)
+
+3. Sections for article content: create separate sections (H2) for each major topic in the given text. Each section should be medium length and explanatory 
+(aim total article content of about 800-1,200 words).
+
+- Name each section with a title that best describes the text as title.
+
+- Provide information that goes in more detail: cover all topics in medium length (600-1,000 words) with a neutral tone, using clear, plain-English explanations 
+for the person who is not expert in the field.
+
+- Ensure all topics are covered
+
+4. Key term definitions section (H2): define all technical terms and expand abbreviations on first use.
+
+5. Top actions (H2): summarize 3-5 immediate, actionable steps.
+"""
+
 
 class TextSummarizerAgent(BaseAgent):
     """Agent that summarizes text using OpenAI models."""
@@ -15,16 +65,24 @@ class TextSummarizerAgent(BaseAgent):
         self,
         client: OpenAI,
         model: str = "gpt-5-nano",
-        instructions: Optional[str] = None
+        instructions: Optional[str] = None,
+        cache_size: int = 256,
+        async_client: Optional[AsyncOpenAI] = None
     ):
         super().__init__(
             name="TextSummarizerAgent",
             description="Summarizes text into well-structured articles using LLM"
         )
         self.client = client
+        self.async_client = async_client
         self.model = model
         self.instructions = instructions or self._get_default_instructions()
         self._logger = logger
+        
+        # (model, text digest, instructions digest) -> article, least recently used first
+        self._article_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
 
     def process(self, input_data: Dict[str, Any]) -> AgentResponse:
         """
@@ -37,6 +95,55 @@ class TextSummarizerAgent(BaseAgent):
         Returns:
             AgentResponse with article or error
         """
+        prepared = self._prepare(input_data)
+        if isinstance(prepared, AgentResponse):
+            return prepared
+
+        # Generate article
+        article, cached = self._generate_article(*prepared)
+        return self._article_response(article, cached)
+
+    async def process_async(self, input_data: Dict[str, Any]) -> AgentResponse:
+        """Async variant of `process`; uses the async client when one was provided."""
+        prepared = self._prepare(input_data)
+        if isinstance(prepared, AgentResponse):
+            return prepared
+
+        if self.async_client is None:
+            article, cached = await asyncio.to_thread(self._generate_article, *prepared)
+        else:
+            article, cached = await self._generate_article_async(*prepared)
+        return self._article_response(article, cached)
+
+    async def process_many_async(self, inputs: List[Dict[str, Any]]) -> List[AgentResponse]:
+        """
+        Summarize several inputs concurrently, preserving input order.
+
+        At most MAX_CONCURRENT_REQUESTS model calls are in flight at once, matching
+        `process_many`, so large batches don't trip rate limits.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def process_one(item: Dict[str, Any]) -> AgentResponse:
+            async with semaphore:
+                return await self.process_async(item)
+
+        return list(await asyncio.gather(*(process_one(item) for item in inputs)))
+
+    def process_many(self, inputs: List[Dict[str, Any]]) -> List[AgentResponse]:
+        """
+        Summarize several inputs concurrently from synchronous code.
+
+        Uses worker threads rather than an event loop so it is safe to call from
+        within a running loop (e.g. a synchronous MCP tool).
+        """
+        if not inputs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(inputs))) as executor:
+            return list(executor.map(self.process, inputs))
+
+    def _prepare(self, input_data: Dict[str, Any]) -> Union[AgentResponse, Tuple[str, str]]:
+        """Validate input and return (text, instructions), or a failed response."""
         # Validate input
         if not input_data or "text" not in input_data:
             return AgentResponse(
@@ -57,10 +164,16 @@ class TextSummarizerAgent(BaseAgent):
         style = input_data.get("style", "neutral")
 
         # Use configurable instructions
-        instructions = self._get_default_instructions(max_length=max_length, style=style)
+        try:
+            instructions = self._get_default_instructions(max_length=max_length, style=style)
+        except TypeError:
+            # Unhashable options (e.g. a list) can't be cache keys; build them uncached
+            instructions = self._get_default_instructions.__wrapped__(max_length=max_length, style=style)
+        return text, instructions
 
-        # Generate article
-        article = self._generate_article(text, instructions)
+    @staticmethod
+    def _article_response(article: Optional[str], cached: bool = False) -> AgentResponse:
+        """Wrap a generated article (or its absence) in an AgentResponse; metadata says whether it was cached."""
         if not article:
             return AgentResponse(
                 status=AgentResponseStatus.FAILED,
@@ -70,72 +183,88 @@ class TextSummarizerAgent(BaseAgent):
 
         return AgentResponse(
             status=AgentResponseStatus.SUCCESS,
-            data={"article": article}
+            data={"article": article},
+            metadata={"cached": cached}
         )
 
-    def _generate_article(self, text: str, instructions: str) -> Optional[str]:
-        """Generate article using the LLM."""
-        messages = [
-            {"role": "system", "content": instructions},
-            {"role": "user", "content": text},
-        ]
+    def _generate_article(self, text: str, instructions: str) -> Tuple[Optional[str], bool]:
+        """
+        Generate article using the LLM, reusing earlier results for identical requests.
+
+        Returns (article, cached); article is None when the model call failed.
+        """
+        model = self.model
+        key = self._cache_key(model, text, instructions)
+        article = self._cache_get(key)
+        if article is not None:
+            return article, True
 
         try:
-            resp = self.client.responses.create(model=self.model, input=messages)
-            article_text = resp.output_text
-            return article_text.strip()
+            resp = self.client.responses.create(model=model, input=self._messages(text, instructions))
+            article = resp.output_text.strip()
         except Exception:
             self._logger.exception("Model call failed")
-            return None
+            return None, False
 
-    @staticmethod
-    def _get_default_instructions(max_length: int = 1000, style: str = "neutral") -> str:
-        """Return summarization instructions, configurable for max_length and style."""
-        base_instructions = """
-You are expert in summarizing text and providing highly readable and informative summary article for users.
-Treat the audience of the article as person who is not familiar of the concepts and who wants to learn them.
+        self._cache_put(key, article)
+        return article, False
 
-# Goals
-1) Write a summary in article form that is easily understandable for a first-time reader with no prior context. The summary must be written in clear 
-descriptive paragraphs—not just bullet points—where each topic is explained in full sentences and connected ideas.
-2) Ensure the content is action-first and uses concrete examples throughout to illustrate key points. Where relevant, incorporate links to verified resources 
-or actionable search queries that the reader can use immediately.
-3) Cover all main topics in the article, providing enough detail, context, and explanation for clarity. To make this happen, before creating the article,
-extract all topics internally first, however do not list the extracted topics in the article but use them when creating the article by following style rules
-and desired structure of the document as described below.
+    async def _generate_article_async(self, text: str, instructions: str) -> Tuple[Optional[str], bool]:
+        """Async variant of `_generate_article` using the async client."""
+        model = self.model
+        key = self._cache_key(model, text, instructions)
+        article = self._cache_get(key)
+        if article is not None:
+            return article, True
 
-# Style rules
-Use plain English; avoid jargon. If you must use a term, define it the first time. Use neutral / impersonal voice.
-No unexplained abbreviations. If you include one, expand it once (for example: Total Addressable Market).
-Format links as Title so they are clickable. Use this format for links
-[Link title](http address)
-Use bullet points only in Top actions and Key term definitions
-
-# Structure of the document
-Use Markdown format and format the structure to look readable for user, use specified font for titles and sections
-
-1. Title (H1)
+        try:
+            resp = await self.async_client.responses.create(model=model, input=self._messages(text, instructions))
+            article = resp.output_text.strip()
+        except Exception:
+            self._logger.exception("Model call failed")
+            return None, False
 
-2. TL;DR (1-2 sentences) (H2)
+        self._cache_put(key, article)
+        return article, False
 
-3. Sections for article content: create separate sections (H2) for each major topic in the given text. Each section should be medium length and explanatory 
-(aim total article content of about 800-1,200 words).
+    @staticmethod
+    def _messages(text: str, instructions: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": text},
+        ]
 
-- Name each section with a title that best describes the text as title.
+    def _cache_key(self, model: str, text: str, instructions: str) -> Tuple[str, str, str]:
+        return (model, self._digest(text), self._digest(instructions))
 
-- Provide information that goes in more detail: cover all topics in medium length (600-1,000 words) with a neutral tone, using clear, plain-English explanations 
-for the person who is not expert in the field.
+    def _cache_get(self, key: Tuple[str, str, str]) -> Optional[str]:
+        with self._cache_lock:
+            article = self._article_cache.get(key)
+            if article is not None:
+                self._article_cache.move_to_end(key)
+            return article
 
-- Ensure all topics are covered
+    def _cache_put(self, key: Tuple[str, str, str], article: Optional[str]) -> None:
+        if not article or self._cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._article_cache[key] = article
+            if len(self._article_cache) > self._cache_size:
+                self._article_cache.popitem(last=False)
 
-4. Key term definitions section (H2): define all technical terms and expand abbreviations on first use.
+    @staticmethod
+    def _digest(value: str) -> str:
+        """Return a short, collision-resistant cache key for a potentially large string."""
+        return hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
 
-5. Top actions (H2): summarize 3-5 immediate, actionable steps.
-"""
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_default_instructions(max_length: int = 1000, style: str = "neutral") -> str:
+        """Return summarization instructions, configurable for max_length and style."""
         # Add configurable instructions for max_length and style
         configurable_instructions = (
             f"\n\n# Additional constraints\n"
             f"Maximum length: {max_length} words.\n"
             f"Style: {style}."
         )
-        return base_instructions + configurable_instructions
\ No newline at end of file
+        return _BASE_INSTRUCTIONS + configurable_instructions
@@ -1,18 +1,72 @@
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional, Union
+import string
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 
+import requests
 from azure.storage.blob import BlobServiceClient
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from requests.adapters import HTTPAdapter
 
 from .protocols import BaseAgent, AgentResponse, AgentResponseStatus
-from .storage import LocalFileStorage, BlobStorage, StateManager
+from .storage import (
+    AppendBlobStorage,
+    BlobStorage,
+    JsonlAppendStorage,
+    LocalFileStorage,
+    StateManager,
+    StateStorage,
+)
 
 logger = logging.getLogger(__name__)
 
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+REQUEST_TIMEOUT = 30
+
+# channels.list and videos.list accept up to 50 comma-separated IDs per request
+CHANNELS_BATCH_SIZE = 50
+VIDEOS_BATCH_SIZE = 50
+MAX_FETCH_WORKERS = 8
+
+# Channel ID (starts with UC and has 24 chars total), @handle, /c/name or /user/name
+_URL_RE = re.compile(
+    r'(?P<id>UC[a-zA-Z0-9_-]{22})|@(?P<at>[a-zA-Z0-9_-]+)|/(?:c|user)/(?P<name>[a-zA-Z0-9_-]+)'
+)
+
+_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+# Channel inputs may be separated by commas and/or whitespace
+_CHAN_SEP = re.compile(r'[,\n\r\t ]+')
+
+
+def _api_error_message(error: requests.HTTPError) -> str:
+    """Describe a failed API call by status code and API message only, never the request URL."""
+    response = error.response
+    if response is None:
+        return "YouTube API request failed"
+    try:
+        message = response.json().get("error", {}).get("message")
+    except (ValueError, AttributeError):
+        message = None
+    if message:
+        return f"YouTube API error {response.status_code}: {message}"
+    return f"YouTube API error {response.status_code}"
+
+
+class VideoInfo(NamedTuple):
+    """Latest video of a channel; converted to a dict only at the response boundary."""
+    channel_id: str
+    channel_title: str
+    video_id: str
+    video_title: str
+    video_description: str
+    published_at: str
+    thumbnail_url: str
+    video_url: str
+
 
 class YouTubeChannelAgent(BaseAgent):
     """Agent that monitors YouTube channels for latest videos."""
@@ -22,23 +76,46 @@ class YouTubeChannelAgent(BaseAgent):
         api_key: str, 
         blob_service_client: Optional[BlobServiceClient] = None,
         use_local_storage: bool = False,
-        local_storage_path: Optional[str] = None
+        local_storage_path: Optional[str] = None,
+        storage: Optional[StateStorage] = None
     ):
         super().__init__(
             name="YouTubeChannelAgent",
             description="Monitors YouTube channels and retrieves latest videos"
         )
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
         
-        # Configure storage based on parameters
-        if use_local_storage or blob_service_client is None:
+        # Call the Data API directly over a pooled session (no discovery document,
+        # keep-alive connections shared by the fetch workers). The key travels as a
+        # header so it never appears in request URLs, exception messages or logs.
+        self._session = requests.Session()
+        self._session.headers["X-Goog-Api-Key"] = api_key
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_FETCH_WORKERS)
+        self._session.mount("https://", adapter)
+        
+        # uploads playlist ID -> (ETag, latest video) for conditional requests
+        self._latest_video_cache: Dict[str, Tuple[str, VideoInfo]] = {}
+        
+        # Configure storage based on parameters. A ".jsonl" state file or blob name
+        # selects the append-log variant, which writes only changed entries per save.
+        if storage is not None:
+            logger.info(f"Using provided storage: {type(storage).__name__}")
+        elif use_local_storage or blob_service_client is None:
             storage_path = local_storage_path or os.getenv("YOUTUBE_MONITOR_STATE_FILE", ".youtube_monitor_state.json")
-            storage = LocalFileStorage(storage_path)
-            logger.info(f"Using local file storage: {storage_path}")
+            if storage_path.endswith(".jsonl"):
+                storage = JsonlAppendStorage(storage_path)
+                logger.info(f"Using local append-log storage: {storage_path}")
+            else:
+                storage = LocalFileStorage(storage_path)
+                logger.info(f"Using local file storage: {storage_path}")
         else:
-            storage = BlobStorage(blob_service_client)
-            logger.info("Using Azure Blob storage")
+            blob_name = os.getenv("YOUTUBE_MONITOR_STATE_BLOB", "last_seen.json")
+            if blob_name.endswith(".jsonl"):
+                storage = AppendBlobStorage(blob_service_client, blob_name=blob_name)
+                logger.info(f"Using Azure append blob storage: {blob_name}")
+            else:
+                storage = BlobStorage(blob_service_client, blob_name=blob_name)
+                logger.info(f"Using Azure Blob storage: {blob_name}")
         
         self.state_manager = StateManager(storage)
         self.state_manager.load()
@@ -65,41 +142,57 @@ class YouTubeChannelAgent(BaseAgent):
         
         try:
             # Process each channel
-            results = []
             new_videos = []
             errors = []
             
+            # Resolve channel IDs first so uploads playlists can be looked up in bulk
+            resolved = []
             for channel_url in channels:
                 try:
                     channel_id = self._resolve_channel_id(channel_url)
                     if not channel_id:
                         errors.append({"channel": channel_url, "error": "Could not resolve channel ID"})
                         continue
-                    
-                    # Get latest video
-                    video_info = self._get_latest_video(channel_id)
+                    resolved.append((channel_url, channel_id))
+                except Exception as e:
+                    logger.exception(f"Error processing channel {channel_url}")
+                    errors.append({"channel": channel_url, "error": str(e)})
+            
+            uploads_playlists = self._get_uploads_playlists_bulk(
+                [channel_id for _, channel_id in resolved]
+            )
+            
+            # Fetch latest videos concurrently; state is only touched on this thread
+            video_infos = self._get_latest_videos(
+                [(channel_id, uploads_playlists.get(channel_id)) for _, channel_id in resolved]
+            )
+            
+            # At most one result per resolved channel; trimmed to the filled prefix below
+            results: List[Optional[Dict[str, Any]]] = [None] * len(resolved)
+            count = 0
+            for (channel_url, channel_id), video_info in zip(resolved, video_infos):
+                try:
                     if not video_info:
                         errors.append({"channel": channel_url, "error": "No videos found"})
                         continue
                     
                     # Check if this is a new video
                     last_seen = self.state_manager.get_last_seen(channel_id)
-                    is_new = last_seen != video_info["video_id"]
+                    is_new = last_seen != video_info.video_id
+                    video = video_info._asdict()
                     
                     # Update state
                     if is_new:
-                        self.state_manager.set_last_seen(channel_id, video_info["video_id"])
-                        new_videos.append(video_info)
+                        self.state_manager.set_last_seen(channel_id, video_info.video_id)
+                        new_videos.append(video)
                     
-                    results.append({
-                        **video_info,
-                        "is_new": is_new,
-                        "channel_url": channel_url
-                    })
+                    results[count] = video | {"is_new": is_new, "channel_url": channel_url}
+                    count += 1
                     
                 except Exception as e:
                     logger.exception(f"Error processing channel {channel_url}")
                     errors.append({"channel": channel_url, "error": str(e)})
+            del results[count:]
             
             # Save state
             self.state_manager.save()
@@ -136,6 +229,75 @@ class YouTubeChannelAgent(BaseAgent):
                 error_type="unexpected_error"
             )
     
+    def get_video_details(self, video_ids: List[str]) -> AgentResponse:
+        """
+        Get metadata for videos, batching up to 50 IDs into each API request.
+        
+        Args:
+            video_ids: YouTube video IDs
+            
+        Returns:
+            AgentResponse with video details in input order and any IDs not found
+        """
+        video_ids = list(dict.fromkeys(vid.strip() for vid in video_ids if isinstance(vid, str) and vid.strip()))
+        if not video_ids:
+            return AgentResponse(
+                status=AgentResponseStatus.FAILED,
+                error="No valid video IDs provided",
+                error_type="validation_error"
+            )
+        
+        details: Dict[str, Dict[str, Any]] = {}
+        try:
+            for start in range(0, len(video_ids), VIDEOS_BATCH_SIZE):
+                batch = video_ids[start:start + VIDEOS_BATCH_SIZE]
+                response = self._api_get(
+                    "videos",
+                    part="snippet,contentDetails",
+                    id=",".join(batch)
+                )
+                for item in response.get("items", []):
+                    snippet = item["snippet"]
+                    details[item["id"]] = {
+                        "video_id": item["id"],
+                        "video_title": snippet["title"],
+                        "channel_id": snippet["channelId"],
+                        "channel_title": snippet["channelTitle"],
+                        "published_at": snippet["publishedAt"],
+                        "duration": item.get("contentDetails", {}).get("duration"),
+                        "video_url": f"https://www.youtube.com/watch?v={item['id']}"
+                    }
+        except requests.HTTPError as e:
+            logger.error(f"YouTube API error getting video details: {e}")
+            return AgentResponse(
+                status=AgentResponseStatus.FAILED,
+                error=_api_error_message(e),
+                error_type="api_error"
+            )
+        except Exception as e:
+            logger.exception("Unexpected error getting video details")
+            return AgentResponse(
+                status=AgentResponseStatus.FAILED,
+                error=str(e),
+                error_type="unexpected_error"
+            )
+        
+        videos = [details[vid] for vid in video_ids if vid in details]
+        missing = [vid for vid in video_ids if vid not in details]
+        if not videos:
+            status = AgentResponseStatus.FAILED
+        elif missing:
+            status = AgentResponseStatus.PARTIAL
+        else:
+            status = AgentResponseStatus.SUCCESS
+        
+        return AgentResponse(
+            status=status,
+            data={"videos": videos, "missing": missing if missing else None},
+            error="No videos found" if not videos else None,
+            error_type="not_found" if not videos else None
+        )
+    
     def _extract_channels(self, input_data: Dict[str, Any]) -> List[str]:
         """Extract channel URLs from input data."""
         if not input_data:
@@ -143,16 +305,20 @@ class YouTubeChannelAgent(BaseAgent):
         
         # Try different input formats
         if "channels" in input_data:
-            # Comma-separated string
+            # Comma- or whitespace-separated string
             channels_str = input_data["channels"]
             if isinstance(channels_str, str):
-                return [url.strip() for url in channels_str.split(",") if url.strip()]
+                return [url for url in _CHAN_SEP.split(channels_str) if url]
         
         if "channel_urls" in input_data:
-            # List of URLs
+            # List of URLs; an entry may itself hold several separated URLs
             urls = input_data["channel_urls"]
             if isinstance(urls, list):
-                return [url.strip() for url in urls if isinstance(url, str) and url.strip()]
+                return [
+                    url
+                    for entry in urls if isinstance(entry, str)
+                    for url in _CHAN_SEP.split(entry) if url
+                ]
         
         return []
     
@@ -164,13 +330,11 @@ class YouTubeChannelAgent(BaseAgent):
             return cached_id
         
         # Extract from URL patterns
-        channel_id = self._extract_channel_id_from_url(channel_url)
+        channel_id, channel_name = self._extract_from_url(channel_url)
         
-        if not channel_id:
+        if not channel_id and channel_name:
             # Try to resolve via API using channel name
-            channel_name = self._extract_channel_name_from_url(channel_url)
-            if channel_name:
-                channel_id = self._resolve_channel_name_to_id(channel_name)
+            channel_id = self._resolve_channel_name_to_id(channel_name)
         
         # Cache the result
         if channel_id:
@@ -178,71 +342,145 @@ class YouTubeChannelAgent(BaseAgent):
         
         return channel_id
     
-    def _extract_channel_id_from_url(self, url: str) -> Optional[str]:
-        """Extract channel ID from URL if it contains one."""
-        # Pattern for channel ID (starts with UC and has 24 chars total)
-        id_match = re.search(r'(UC[a-zA-Z0-9_-]{22})', url)
-        if id_match:
-            return id_match.group(1)
-        return None
-    
-    def _extract_channel_name_from_url(self, url: str) -> Optional[str]:
-        """Extract channel name from URL patterns like @channelname."""
-        # Pattern for @username
-        at_match = re.search(r'@([a-zA-Z0-9_-]+)', url)
-        if at_match:
-            return at_match.group(1)
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_from_url(url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract (channel_id, channel_name) from a channel URL in a single scan.
         
-        # Pattern for /c/channelname or /user/username
-        path_match = re.search(r'/(?:c|user)/([a-zA-Z0-9_-]+)', url)
-        if path_match:
-            return path_match.group(1)
+        A channel ID wins over a name; an @handle wins over /c/ or /user/ paths.
+        """
+        # Well-formed channel URLs are recognised from the path alone
+        try:
+            parts = urlparse(url).path.strip("/").split("/")
+        except ValueError:
+            # e.g. an invalid IPv6 host; leave it to the pattern scan below
+            parts = [""]
+        head = parts[0]
+        if head == "channel" and len(parts) > 1:
+            if len(parts[1]) == 24 and parts[1].startswith("UC") and _NAME_CHARS.issuperset(parts[1]):
+                return parts[1], None
+        elif head.startswith("@"):
+            if len(head) > 1 and _NAME_CHARS.issuperset(head[1:]):
+                return None, head[1:]
+        elif head in ("c", "user") and len(parts) > 1:
+            if parts[1] and _NAME_CHARS.issuperset(parts[1]):
+                return None, parts[1]
         
-        return None
+        # Anything else (bare IDs, unusual URLs): scan with the combined pattern
+        at_name = path_name = None
+        for match in _URL_RE.finditer(url):
+            if match.group("id"):
+                return match.group("id"), None
+            if match.group("at"):
+                at_name = at_name or match.group("at")
+            else:
+                path_name = path_name or match.group("name")
+        return None, at_name or path_name
     
     def _resolve_channel_name_to_id(self, channel_name: str) -> Optional[str]:
         """Resolve channel name to channel ID using YouTube API."""
         try:
             # Search for channel
-            request = self.youtube.search().list(
+            response = self._api_get(
+                "search",
                 part="snippet",
                 q=channel_name,
                 type="channel",
                 maxResults=1
             )
-            response = request.execute()
             
             if response.get("items"):
                 return response["items"][0]["snippet"]["channelId"]
-        except HttpError as e:
+        except requests.HTTPError as e:
             logger.error(f"YouTube API error resolving channel name {channel_name}: {e}")
         except Exception as e:
             logger.exception(f"Error resolving channel name {channel_name}")
         
         return None
     
-    def _get_latest_video(self, channel_id: str) -> Optional[Dict[str, Any]]:
-        """Get the latest video from a channel."""
-        try:
-            # Get channel's uploads playlist
-            request = self.youtube.channels().list(
-                part="contentDetails",
-                id=channel_id
-            )
-            response = request.execute()
+    def _get_uploads_playlists_bulk(self, channel_ids: List[str]) -> Dict[str, str]:
+        """Map channel IDs to their uploads playlist IDs, batching API requests."""
+        playlists: Dict[str, str] = {}
+        unique_ids = list(dict.fromkeys(channel_ids))
+        
+        for start in range(0, len(unique_ids), CHANNELS_BATCH_SIZE):
+            batch = unique_ids[start:start + CHANNELS_BATCH_SIZE]
+            try:
+                response = self._api_get(
+                    "channels",
+                    part="contentDetails",
+                    id=",".join(batch),
+                    maxResults=CHANNELS_BATCH_SIZE
+                )
+            except requests.HTTPError as e:
+                logger.error(f"YouTube API error getting channels {', '.join(batch)}: {e}")
+                continue
+            except Exception as e:
+                logger.exception(f"Error getting channels {', '.join(batch)}")
+                continue
             
-            if not response.get("items"):
+            for item in response.get("items", []):
+                playlists[item["id"]] = item["contentDetails"]["relatedPlaylists"]["uploads"]
+        
+        return playlists
+    
+    def _get_latest_videos(
+        self, channels: List[Tuple[str, Optional[str]]]
+    ) -> List[Optional[VideoInfo]]:
+        """Get latest videos for (channel_id, uploads_playlist_id) pairs concurrently."""
+        if not channels:
+            return []
+        
+        def fetch(channel: Tuple[str, Optional[str]]) -> Optional[VideoInfo]:
+            channel_id, uploads_playlist_id = channel
+            if not uploads_playlist_id:
                 return None
-            
-            uploads_playlist_id = response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-            
-            # Get latest video from uploads playlist
-            request = self.youtube.playlistItems().list(
+            return self._get_latest_video(channel_id, uploads_playlist_id)
+        
+        max_workers = min(MAX_FETCH_WORKERS, len(channels))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, channels))
+    
+    def _api_get(self, resource: str, **params: Any) -> Dict[str, Any]:
+        """Issue a GET against a YouTube Data API v3 resource and return the JSON body."""
+        return self._api_get_conditional(resource, None, **params)[0]
+    
+    def _api_get_conditional(
+        self, resource: str, etag: Optional[str], **params: Any
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Issue a GET sending If-None-Match when an ETag is known.
+        
+        Returns (body, etag); body is None when the server answered 304 Not Modified.
+        """
+        response = self._session.get(
+            f"{YOUTUBE_API_URL}/{resource}",
+            params=params,
+            headers={"If-None-Match": etag} if etag else None,
+            timeout=REQUEST_TIMEOUT
+        )
+        if etag and response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+        return response.json(), response.headers.get("ETag")
+    
+    def _get_latest_video(self, channel_id: str, uploads_playlist_id: str) -> Optional[VideoInfo]:
+        """Get the latest video from a channel's uploads playlist."""
+        try:
+            # Get latest video from uploads playlist, revalidating the last response
+            cached = self._latest_video_cache.get(uploads_playlist_id)
+            response, etag = self._api_get_conditional(
+                "playlistItems",
+                cached[0] if cached else None,
                 part="snippet",
                 playlistId=uploads_playlist_id,
                 maxResults=1
             )
-            response = request.execute()
+            
+            if response is None:
+                # 304 Not Modified: the latest video has not changed
+                return cached[1]
             
             if not response.get("items"):
                 return None
@@ -250,20 +488,27 @@ class YouTubeChannelAgent(BaseAgent):
             video_item = response["items"][0]
             snippet = video_item["snippet"]
             
-            return {
-                "channel_id": channel_id,
-                "channel_title": snippet["channelTitle"],
-                "video_id": snippet["resourceId"]["videoId"],
-                "video_title": snippet["title"],
-                "video_description": snippet.get("description", "")[:200] + "...",
-                "published_at": snippet["publishedAt"],
-                "thumbnail_url": snippet["thumbnails"]["high"]["url"],
-                "video_url": f"https://www.youtube.com/watch?v={snippet['resourceId']['videoId']}"
-            }
+            video_id = snippet["resourceId"]["videoId"]
+            description = snippet.get("description") or ""
+            if len(description) > 200:
+                description = description[:200] + "..."
+            video_info = VideoInfo(
+                channel_id=channel_id,
+                channel_title=snippet["channelTitle"],
+                video_id=video_id,
+                video_title=snippet["title"],
+                video_description=description,
+                published_at=snippet["publishedAt"],
+                thumbnail_url=snippet["thumbnails"]["high"]["url"],
+                video_url=f"https://www.youtube.com/watch?v={video_id}"
+            )
+            if etag:
+                self._latest_video_cache[uploads_playlist_id] = (etag, video_info)
+            return video_info
             
-        except HttpError as e:
+        except requests.HTTPError as e:
             logger.error(f"YouTube API error getting latest video for channel {channel_id}: {e}")
         except Exception as e:
             logger.exception(f"Error getting latest video for channel {channel_id}")
         
-        return None
\ No newline at end of file
+        return None
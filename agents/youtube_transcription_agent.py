@@ -1,8 +1,13 @@
 import logging
 import re
-from typing import Any, Dict, List, Sequence
-from urllib.parse import parse_qs, urlparse
+import string
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
 
+import requests
+from requests.adapters import HTTPAdapter
 from youtube_transcript_api import (
     YouTubeTranscriptApi,
     NoTranscriptFound,
@@ -14,6 +19,48 @@ from .protocols import BaseAgent, AgentResponse, AgentResponseStatus
 
 logger = logging.getLogger(__name__)
 
+# An 11-character video ID in a known URL position
+_URL_ID_RE = re.compile(r"(?:[?&]v=|/embed/|/v/|youtu\.be/|youtube\.com/shorts/)([0-9A-Za-z_-]{11})")
+_VID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+_VID_ANY_RE = re.compile(r"[0-9A-Za-z_-]{11}")
+# YouTube hosts: the bare domains plus any of their subdomains (www., m., music.)
+_YT_HOSTS = frozenset(("youtube.com", "youtu.be"))
+_YT_SUFFIXES = (".youtube.com", ".youtu.be")
+
+
+def _build_transcript_api() -> YouTubeTranscriptApi:
+    """Create a transcript client whose session keeps connections alive across fetches."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+    session.mount("https://", adapter)
+    return YouTubeTranscriptApi(http_client=session)
+
+
+# YouTubeTranscriptApi is not thread-safe (it mutates its session's cookies and
+# headers, e.g. the consent cookie), so each thread reuses its own instance
+_local = threading.local()
+
+
+def _get_transcript_api() -> YouTubeTranscriptApi:
+    """Return this thread's transcript client, creating it on first use."""
+    api = getattr(_local, "transcript_api", None)
+    if api is None:
+        api = _local.transcript_api = _build_transcript_api()
+    return api
+
+
+@lru_cache(maxsize=256)
+def _cached_fetch_texts(video_id: str) -> Tuple[str, ...]:
+    """
+    Fetch only the segment texts, once per video ID for the lifetime of the process.
+    
+    Only the text is needed to build a transcript, so timing is dropped at fetch
+    time and cache entries hold one string per segment.
+    """
+    data = _get_transcript_api().fetch(video_id=video_id)
+    # Read snippets straight off the fetched transcript; a raw list of dicts is accepted as well
+    return tuple(seg.get("text", "") if isinstance(seg, dict) else seg.text for seg in data)
+
 
 class YouTubeTranscriptionAgent(BaseAgent):
     """Agent responsible for extracting transcripts from YouTube videos.
@@ -47,10 +94,21 @@ class YouTubeTranscriptionAgent(BaseAgent):
                 error_type="validation_error"
             )
         
+        return self.process_ids(url=input_data.get("url"), video_id=input_data.get("video_id"))
+    
+    def process_ids(self, url: Optional[str] = None, video_id: Optional[str] = None) -> AgentResponse:
+        """
+        Extract a transcript from a YouTube URL or video ID passed directly.
+        
+        Args:
+            url: YouTube URL
+            video_id: YouTube video ID; takes precedence over url
+            
+        Returns:
+            AgentResponse with transcript data or error
+        """
         # Check for video_id first (more direct)
-        video_id = None
-        if "video_id" in input_data:
-            video_id = input_data["video_id"]
+        if video_id is not None:
             if not isinstance(video_id, str):
                 return AgentResponse(
                     status=AgentResponseStatus.FAILED,
@@ -65,8 +123,7 @@ class YouTubeTranscriptionAgent(BaseAgent):
                 )
         
         # If no video_id, check for URL
-        elif "url" in input_data:
-            url = input_data["url"]
+        elif url is not None:
             if not isinstance(url, str):
                 return AgentResponse(
                     status=AgentResponseStatus.FAILED,
@@ -94,7 +151,7 @@ class YouTubeTranscriptionAgent(BaseAgent):
         
         # Fetch transcript
         try:
-            raw_segments = self._fetch_raw(video_id)
+            texts = self._fetch_texts_only(video_id)
         except TranscriptsDisabled as exc:
             return AgentResponse(
                 status=AgentResponseStatus.FAILED,
@@ -122,7 +179,7 @@ class YouTubeTranscriptionAgent(BaseAgent):
             )
         
         # Convert segments to text
-        transcript = self._segments_to_text(raw_segments)
+        transcript = self._join_texts(texts)
         if not transcript:
             return AgentResponse(
                 status=AgentResponseStatus.FAILED,
@@ -139,66 +196,58 @@ class YouTubeTranscriptionAgent(BaseAgent):
         )
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _extract_video_id(url: str) -> str:
         """Extract YouTube video ID from various URL formats."""
         if not url:
             raise ValueError("Empty URL provided")
 
-        parsed = urlparse(url)
-        hostname = (parsed.hostname or "").lower()
-
-        # Standard watch?v=VIDEOID
-        if "youtube.com" in hostname:
-            qs = parse_qs(parsed.query)
-            if "v" in qs and qs["v"]:
-                vid = qs["v"][0]
-                if len(vid) == 11:
-                    return vid
-            # /embed/VIDEOID, /v/VIDEOID
-            parts = parsed.path.split("/")
-            for idx, part in enumerate(parts):
-                if part in ("embed", "v") and idx + 1 < len(parts):
-                    candidate = parts[idx + 1]
-                    if len(candidate) == 11:
-                        return candidate
-
-        # Short URL youtu.be/VIDEOID
-        if "youtu.be" in hostname:
-            candidate = parsed.path.lstrip("/")
-            if candidate:
-                candidate = candidate.split("?")[0].split("/")[0]
-                if re.match(r"^[0-9A-Za-z_-]{11}", candidate):
-                    return candidate[:11]
+        # Already a bare video ID
+        if len(url) == 11 and _VID_CHARS.issuperset(url):
+            return url
 
-        # Fallback: first 11-char ID found anywhere
-        m = re.search(r"([0-9A-Za-z_-]{11})", url)
+        # A full URL must point at a YouTube host; look-alikes such as
+        # evil-youtube.com are rejected rather than mined for an ID
+        if "://" in url:
+            hostname = urlparse(url).hostname or ""
+            if not (hostname in _YT_HOSTS or hostname.endswith(_YT_SUFFIXES)):
+                raise ValueError(f"Not a YouTube URL: {url}")
+
+        # watch?v=, /embed/, /v/, youtu.be/ and /shorts/ forms in a single scan
+        m = _URL_ID_RE.search(url)
         if m:
             return m.group(1)
 
+        # Fallback: first 11-char ID found anywhere
+        m = _VID_ANY_RE.search(url)
+        if m:
+            return m.group(0)
+
         raise ValueError(f"Could not extract YouTube video ID from URL: {url}")
     
-    def _fetch_raw(self, video_id: str) -> List[Dict[str, Any]]:
-        """Fetch raw transcript segments using YouTubeTranscriptApi."""
+    def _fetch_texts_only(self, video_id: str) -> Tuple[str, ...]:
+        """Fetch transcript segment texts (cached) using YouTubeTranscriptApi."""
         if not video_id:
             raise ValueError("video_id is required")
 
-        yt = YouTubeTranscriptApi()
-        data = yt.fetch(video_id=video_id)
-        
-        try:
-            raw = data.to_raw_data()
-        except Exception:
-            # In case the fetch result is already a raw list/dict
-            if isinstance(data, list):
-                return data
-            raise
-        return raw
+        return _cached_fetch_texts(video_id)
+    
+    @staticmethod
+    def get_cache_info():
+        """Return hit/miss statistics for the transcript cache."""
+        return _cached_fetch_texts.cache_info()
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached transcripts."""
+        _cached_fetch_texts.cache_clear()
     
     @staticmethod
-    def _segments_to_text(segments: Sequence[Dict[str, Any]]) -> str:
-        """Join segment texts into a single normalized string."""
-        return " ".join(
-            seg.get("text", "").strip() 
-            for seg in segments 
-            if seg.get("text")
-        ).strip()
\ No newline at end of file
+    def _join_texts(texts: Iterable[Optional[str]]) -> str:
+        """Join texts into a single string with all whitespace runs collapsed."""
+        words = []
+        extend = words.extend
+        for text in texts:
+            if text:
+                extend(text.split())
+        return " ".join(words)
\ No newline at end of file
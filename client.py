@@ -45,7 +45,8 @@ async def test_youtube_tools():
             # 2. Check server health
             print("📋 Checking server health...")
             health = await session.call_tool("health_check", arguments={})
-            health_data = json.loads(health.content[0].text)
+            # Newer servers return structured content; older ones only JSON text
+            health_data = getattr(health, "structuredContent", None) or json.loads(health.content[0].text)
             print(f"Status: {health_data['status']}")
             print(f"API Keys configured: {health_data['apis_configured']}\n")
             
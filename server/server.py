@@ -1,8 +1,12 @@
 """FastMCP server for YouTube tools."""
 
+import importlib.util
 import os
 import sys
 import logging
+from typing import Awaitable, Callable
+
+import anyio
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
 
@@ -17,7 +21,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create FastMCP server instance
+# Create FastMCP server instance. Tool results are serialized by FastMCP itself
+# with pydantic_core (Rust), so there is no Python JSON encoder to swap out here.
 mcp = FastMCP(
     name="YouTubeTools",
     host="0.0.0.0",  # only used for SSE transport
@@ -29,6 +34,15 @@ mcp = FastMCP(
 from . import tools  # This will execute the @mcp.tool() decorators
 
 
+def _run_network_transport(run: Callable[[], Awaitable[None]]) -> None:
+    """Run a network transport, on a uvloop event loop when uvloop is installed."""
+    # anyio creates the uvloop loop for this run only; no global loop policy is touched
+    use_uvloop = importlib.util.find_spec("uvloop") is not None
+    if use_uvloop:
+        logger.info("Using uvloop event loop")
+    anyio.run(run, backend_options={"use_uvloop": use_uvloop})
+
+
 def main():
     """Main entry point for the MCP server."""
     # Check for required environment variables
@@ -50,6 +64,7 @@ def main():
     logger.info("  - summarize_text: Summarize text using AI")
     logger.info("  - youtube_channels_monitor: Monitor YouTube channels")
     logger.info("  - youtube_channel_latest: Get latest video from channel")
+    logger.info("  - youtube_videos_details: Get metadata for videos in batches")
     logger.info("  - youtube_summarize_latest: Get and summarize latest videos")
     logger.info("  - health_check: Check server health status")
     logger.info("=" * 60)
@@ -59,10 +74,10 @@ def main():
         mcp.run(transport="stdio")
     elif transport == "sse":
         logger.info(f"Running server with SSE transport")
-        mcp.run(transport="sse")
+        _run_network_transport(mcp.run_sse_async)
     elif transport == "streamable-http":
         logger.info("Running server with Streamable HTTP transport")
-        mcp.run(transport="streamable-http")
+        _run_network_transport(mcp.run_streamable_http_async)
     else:
         raise ValueError(f"Unknown transport: {transport}")
 
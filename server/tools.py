@@ -1,10 +1,13 @@
 """Tool definitions for the MCP server."""
 
+import functools
 import os
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional
 
-from openai import OpenAI
+from pydantic import BaseModel
 
 # Import agents from parent directory
 import sys
@@ -12,11 +15,14 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from agents import (
-    YouTubeTranscriptionAgent,
-    TextSummarizerAgent,
-    YouTubeChannelAgent
+    AgentResponse,
+    AgentResponseStatus,
+    YouTubeTranscriptionAgent
 )
 
+if TYPE_CHECKING:
+    from agents import TextSummarizerAgent, YouTubeChannelAgent
+
 # Import the server instance
 from .server import mcp
 
@@ -27,43 +33,70 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Agent instances (created on first use)
-_agents = {
-    "youtube_transcription": None,
-    "text_summarizer": None,
-    "youtube_channel": None
-}
+# Upper bound on videos transcribed and summarized concurrently
+MAX_SUMMARY_WORKERS = 8
+
+# API keys are read once; .env has already been loaded by the server module
+_OPENAI_KEY = os.environ.get("OPENAI_API_KEY")
+_YT_KEY = os.environ.get("YOUTUBE_API_KEY")
+_KEYS_CONFIGURED = (bool(_OPENAI_KEY), bool(_YT_KEY))
+
+
+def _keys_configured() -> tuple:
+    """Return (openai_configured, youtube_configured) as read at startup."""
+    return _KEYS_CONFIGURED
+
+
+# Agent instances (created on first use). The getters below are memoized with
+# functools.cache for a lock-free fast path; first construction goes through the
+# lock so concurrent first calls still share a single instance.
+_agents: Dict[str, Any] = {}
+_agents_lock = threading.Lock()
 
 
+def _get_or_create_agent(name: str, factory: Callable[[], Any]) -> Any:
+    """Return the named agent, constructing it exactly once."""
+    with _agents_lock:
+        agent = _agents.get(name)
+        if agent is None:
+            agent = _agents[name] = factory()
+        return agent
+
+
+@functools.cache
 def get_youtube_transcription_agent() -> YouTubeTranscriptionAgent:
     """Get or create YouTube transcription agent."""
-    if _agents["youtube_transcription"] is None:
-        _agents["youtube_transcription"] = YouTubeTranscriptionAgent()
-    return _agents["youtube_transcription"]
+    return _get_or_create_agent("youtube_transcription", YouTubeTranscriptionAgent)
 
 
-def get_text_summarizer_agent() -> TextSummarizerAgent:
+@functools.cache
+def get_text_summarizer_agent() -> "TextSummarizerAgent":
     """Get or create text summarizer agent."""
-    if _agents["text_summarizer"] is None:
-        openai_api_key = os.environ.get("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise RuntimeError("OPENAI_API_KEY environment variable is required")
-        openai_client = OpenAI(api_key=openai_api_key)
-        _agents["text_summarizer"] = TextSummarizerAgent(client=openai_client)
-    return _agents["text_summarizer"]
+    # Raising is not cached, so a missing key is reported on every call
+    if not _OPENAI_KEY:
+        raise RuntimeError("OPENAI_API_KEY environment variable is required")
+
+    def create() -> "TextSummarizerAgent":
+        # Deferred so servers that never summarize don't pay for importing openai
+        from openai import OpenAI
+        from agents import TextSummarizerAgent
+        return TextSummarizerAgent(client=OpenAI(api_key=_OPENAI_KEY))
 
+    return _get_or_create_agent("text_summarizer", create)
 
-def get_youtube_channel_agent() -> YouTubeChannelAgent:
+
+@functools.cache
+def get_youtube_channel_agent() -> "YouTubeChannelAgent":
     """Get or create YouTube channel agent."""
-    if _agents["youtube_channel"] is None:
-        youtube_api_key = os.environ.get("YOUTUBE_API_KEY")
-        if not youtube_api_key:
-            raise RuntimeError("YOUTUBE_API_KEY environment variable is required")
-        _agents["youtube_channel"] = YouTubeChannelAgent(
-            api_key=youtube_api_key,
-            use_local_storage=True
-        )
-    return _agents["youtube_channel"]
+    if not _YT_KEY:
+        raise RuntimeError("YOUTUBE_API_KEY environment variable is required")
+
+    def create() -> "YouTubeChannelAgent":
+        # Deferred so the azure storage SDK is only imported when channels are used
+        from agents import YouTubeChannelAgent
+        return YouTubeChannelAgent(api_key=_YT_KEY, use_local_storage=True)
+
+    return _get_or_create_agent("youtube_channel", create)
 
 
 @mcp.tool()
@@ -84,14 +117,8 @@ def youtube_transcribe(url: Optional[str] = None, video_id: Optional[str] = None
     try:
         agent = get_youtube_transcription_agent()
         
-        input_data = {}
-        if url:
-            input_data["url"] = url
-        if video_id:
-            input_data["video_id"] = video_id
-        
         logger.info(f"Extracting transcript for: {url or video_id}")
-        response = agent.process(input_data)
+        response = agent.process_ids(url=url or None, video_id=video_id or None)
         
         if response.success and response.data:
             return {
@@ -140,11 +167,13 @@ def summarize_text(
         })
         
         if response.success and response.data:
+            # The summarizer agent caches articles; report whether this was a hit
             return {
                 "summary": response.data.get("summary", response.data.get("article", "")),
                 "style": style,
                 "model": model,
-                "metadata": response.metadata
+                "metadata": response.metadata,
+                "cached": bool((response.metadata or {}).get("cached"))
             }
         else:
             return {"error": response.error or "Failed to summarize text"}
@@ -153,6 +182,17 @@ def summarize_text(
         return {"error": str(e)}
 
 
+def _fetch_channel_videos(channels: List[str]) -> AgentResponse:
+    """Run the channel agent directly and return its raw response."""
+    agent = get_youtube_channel_agent()
+    
+    logger.info(f"Monitoring {len(channels)} YouTube channels")
+    # Hand lists over as-is rather than joining and re-splitting them
+    if isinstance(channels, list):
+        return agent.process({"channel_urls": channels})
+    return agent.process({"channels": channels})
+
+
 @mcp.tool()
 def youtube_channels_monitor(channels: List[str]) -> Dict[str, Any]:
     """
@@ -168,13 +208,7 @@ def youtube_channels_monitor(channels: List[str]) -> Dict[str, Any]:
         return {"error": "At least one channel is required"}
     
     try:
-        agent = get_youtube_channel_agent()
-        
-        # Convert list to comma-separated string if needed
-        channels_str = ", ".join(channels) if isinstance(channels, list) else channels
-        
-        logger.info(f"Monitoring {len(channels)} YouTube channels")
-        response = agent.process({"channels": channels_str})
+        response = _fetch_channel_videos(channels)
         
         if response.success and response.data:
             data = response.data
@@ -234,6 +268,39 @@ def youtube_channel_latest(channel_id: str) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+@mcp.tool()
+def youtube_videos_details(video_ids: List[str]) -> Dict[str, Any]:
+    """
+    Get metadata for YouTube videos in as few API requests as possible.
+    
+    Args:
+        video_ids: List of YouTube video IDs (up to 50 are fetched per request)
+        
+    Returns:
+        Dictionary containing video details and any IDs that were not found
+    """
+    if not video_ids:
+        return {"error": "At least one video ID is required"}
+    
+    try:
+        agent = get_youtube_channel_agent()
+        
+        logger.info(f"Getting details for {len(video_ids)} YouTube videos")
+        response = agent.get_video_details(video_ids)
+        
+        if response.success or response.status == AgentResponseStatus.PARTIAL:
+            return {
+                "videos": response.data.get("videos", []),
+                "missing": response.data.get("missing") or [],
+                "metadata": response.metadata
+            }
+        else:
+            return {"error": response.error or "Failed to get video details"}
+    except Exception as e:
+        logger.error(f"Error in youtube_videos_details: {str(e)}")
+        return {"error": str(e)}
+
+
 @mcp.tool()
 def youtube_summarize_latest(
     channels: List[str],
@@ -252,47 +319,63 @@ def youtube_summarize_latest(
         Dictionary containing summaries of latest videos
     """
     try:
+        if not channels:
+            return {"error": "At least one channel is required"}
+        
         # First, get latest videos from channels
-        channel_result = youtube_channels_monitor(channels)
+        channel_response = _fetch_channel_videos(channels)
         
-        if "error" in channel_result:
-            return channel_result
+        if not (channel_response.success and channel_response.data):
+            return {"error": channel_response.error or "Failed to monitor channels"}
         
+        channel_data = channel_response.data
         summaries = []
-        videos_to_process = channel_result.get("new_videos", [])[:max_videos]
+        videos_to_process = channel_data.get("new_videos", [])[:max_videos]
         
         if not videos_to_process:
-            videos_to_process = channel_result.get("all_videos", [])[:max_videos]
+            videos_to_process = channel_data.get("videos", [])[:max_videos]
         
-        for video in videos_to_process:
+        def summarize_video(video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             try:
                 # Get transcript
                 transcript_result = youtube_transcribe(video_id=video.get("video_id"))
                 
-                if "error" not in transcript_result:
-                    transcript = transcript_result.get("transcript", "")
-                    
-                    # Summarize transcript
-                    summary_result = summarize_text(
-                        text=transcript,
-                        max_length=500,
-                        style=summary_style
-                    )
-                    
-                    if "error" not in summary_result:
-                        summaries.append({
-                            "channel": video.get("channel_title", ""),
-                            "title": video.get("video_title", ""),
-                            "url": video.get("video_url", ""),
-                            "published": video.get("published_at", ""),
-                            "summary": summary_result.get("summary", "")
-                        })
-                        
+                if "error" in transcript_result:
+                    return None
+                transcript = transcript_result.get("transcript", "")
+                
+                # Summarize transcript
+                summary_result = summarize_text(
+                    text=transcript,
+                    max_length=500,
+                    style=summary_style
+                )
+                
+                if "error" in summary_result:
+                    return None
+                return {
+                    "channel": video.get("channel_title", ""),
+                    "title": video.get("video_title", ""),
+                    "url": video.get("video_url", ""),
+                    "published": video.get("published_at", ""),
+                    "summary": summary_result.get("summary", "")
+                }
             except Exception as e:
                 logger.error(f"Error processing video {video.get('video_title', 'Unknown')}: {e}")
+                return None
+        
+        # Transcript fetches and summarization are I/O bound; overlap them across videos
+        if videos_to_process:
+            max_workers = min(MAX_SUMMARY_WORKERS, len(videos_to_process))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                summaries = [
+                    summary
+                    for summary in executor.map(summarize_video, videos_to_process)
+                    if summary
+                ]
         
         return {
-            "channels_processed": channel_result.get("successful_channels", 0),
+            "channels_processed": channel_data.get("successful_channels", 0),
             "videos_found": len(videos_to_process),
             "summaries_generated": len(summaries),
             "summaries": summaries
@@ -302,20 +385,29 @@ def youtube_summarize_latest(
         return {"error": str(e)}
 
 
+class HealthStatus(BaseModel):
+    """Health check payload; typed so FastMCP can return it as structured content."""
+    status: str
+    server_name: str
+    server_version: str
+    apis_configured: Dict[str, bool]
+
+
 @mcp.tool()
-def health_check() -> Dict[str, Any]:
+def health_check() -> HealthStatus:
     """
     Check the health status of the YouTube tools server.
     
     Returns:
-        Dictionary containing health status and API key availability
+        Health status and API key availability
     """
-    return {
-        "status": "healthy",
-        "server_name": "YouTubeTools",
-        "server_version": "0.1.0",
-        "apis_configured": {
-            "openai_api_key": bool(os.environ.get("OPENAI_API_KEY")),
-            "youtube_api_key": bool(os.environ.get("YOUTUBE_API_KEY"))
+    openai_configured, youtube_configured = _keys_configured()
+    return HealthStatus(
+        status="healthy",
+        server_name="YouTubeTools",
+        server_version="0.1.0",
+        apis_configured={
+            "openai_api_key": openai_configured,
+            "youtube_api_key": youtube_configured
         }
-    }
\ No newline at end of file
+    )
\ No newline at end of file